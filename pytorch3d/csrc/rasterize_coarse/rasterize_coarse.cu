@@ -21,6 +21,7 @@ __global__ void TriangleBoundingBoxKernel(
     const float* face_verts, // (F, 3, 3)
     const int F,
     const float blur_radius,
+    const bool cull_backfaces,
     float* bboxes, // (4, F)
     bool* skip_face) { // (F,)
   const int tid = blockIdx.x * blockDim.x + threadIdx.x;
@@ -41,7 +42,16 @@ __global__ void TriangleBoundingBoxKernel(
     const float ymin = FloatMin3(v0y, v1y, v2y) - sqrt_radius;
     const float ymax = FloatMax3(v0y, v1y, v2y) + sqrt_radius;
     const float zmin = FloatMin3(v0z, v1z, v2z);
-    const bool skip = zmin < kEpsilon;
+    // Faces which the fine rasterizer would reject for their area (back
+    // facing or degenerate) are also dropped here so they never take up
+    // space in the bins.
+    const float face_area = EdgeFunctionForward(
+        make_float2(v0x, v0y), make_float2(v1x, v1y), make_float2(v2x, v2y));
+    const bool back_face = face_area < 0.0f;
+    const bool zero_face_area =
+        (face_area <= kEpsilon && face_area >= -1.0f * kEpsilon);
+    const bool skip =
+        zmin < kEpsilon || zero_face_area || (cull_backfaces && back_face);
     bboxes[0 * F + f] = xmin;
     bboxes[1 * F + f] = xmax;
     bboxes[2 * F + f] = ymin;
@@ -272,7 +282,8 @@ at::Tensor RasterizeMeshesCoarseCuda(
     const std::tuple<int, int> image_size,
     const float blur_radius,
     const int bin_size,
-    const int max_faces_per_bin) {
+    const int max_faces_per_bin,
+    const bool cull_backfaces) {
   TORCH_CHECK(
       face_verts.ndimension() == 3 && face_verts.size(1) == 3 &&
           face_verts.size(2) == 3,
@@ -305,6 +316,7 @@ at::Tensor RasterizeMeshesCoarseCuda(
       face_verts.contiguous().data_ptr<float>(),
       F,
       blur_radius,
+      cull_backfaces,
       bboxes.contiguous().data_ptr<float>(),
       should_skip.contiguous().data_ptr<bool>());
   AT_CUDA_CHECK(cudaGetLastError());
@@ -21,7 +21,8 @@ torch::Tensor RasterizeMeshesCoarseCuda(
     const std::tuple<int, int> image_size,
     const float blur_radius,
     const int bin_size,
-    const int max_faces_per_bin);
+    const int max_faces_per_bin,
+    const bool cull_backfaces);
 #endif
 
 // Arguments are the same as RasterizePointsCoarse from
@@ -256,7 +256,8 @@ torch::Tensor RasterizeMeshesCoarseCpu(
     const std::tuple<int, int> image_size,
     const float blur_radius,
     const int bin_size,
-    const int max_faces_per_bin);
+    const int max_faces_per_bin,
+    const bool cull_backfaces);
 
 // Args:
 //    face_verts: Tensor of shape (F, 3, 3) giving (packed) vertex positions for
@@ -276,6 +277,8 @@ torch::Tensor RasterizeMeshesCoarseCpu(
 //                 is required.
 //    bin_size: Size of each bin within the image (in pixels)
 //    max_faces_per_bin: Maximum number of faces to count in each bin.
+//    cull_backfaces: Bool, Whether to skip faces which are facing away from
+//                    the camera. Faces with zero area are always skipped.
 //
 // Returns:
 //   bin_face_idxs: Tensor of shape (N, num_bins, num_bins, K) giving the
@@ -288,7 +291,8 @@ torch::Tensor RasterizeMeshesCoarse(
     const std::tuple<int, int> image_size,
     const float blur_radius,
     const int bin_size,
-    const int max_faces_per_bin) {
+    const int max_faces_per_bin,
+    const bool cull_backfaces) {
   if (face_verts.is_cuda()) {
 #ifdef WITH_CUDA
     CHECK_CUDA(face_verts);
@@ -301,7 +305,8 @@ torch::Tensor RasterizeMeshesCoarse(
         image_size,
         blur_radius,
         bin_size,
-        max_faces_per_bin);
+        max_faces_per_bin,
+        cull_backfaces);
 #else
     AT_ERROR("Not compiled with GPU support");
 #endif
@@ -313,7 +318,8 @@ torch::Tensor RasterizeMeshesCoarse(
         image_size,
         blur_radius,
         bin_size,
-        max_faces_per_bin);
+        max_faces_per_bin,
+        cull_backfaces);
   }
 }
 
@@ -520,7 +526,8 @@ RasterizeMeshes(
         image_size,
         blur_radius,
         bin_size,
-        max_faces_per_bin);
+        max_faces_per_bin,
+        cull_backfaces);
     return RasterizeMeshesFine(
         face_verts,
         bin_faces,
@@ -29,6 +29,9 @@ auto ComputeFaceBoundingBoxes(const torch::Tensor& face_verts) {
   auto float_opts = face_verts.options().dtype(torch::kFloat32);
   auto face_verts_a = face_verts.accessor<float, 3>();
   torch::Tensor face_bboxes = torch::full({total_F, 6}, -2.0, float_opts);
+  // Write through an accessor: indexing the tensor directly goes through the
+  // dispatcher for every element.
+  auto face_bboxes_a = face_bboxes.accessor<float, 2>();
 
   // Loop through all the faces
   for (int f = 0; f < total_F; ++f) {
@@ -45,12 +48,12 @@ auto ComputeFaceBoundingBoxes(const torch::Tensor& face_verts) {
     const float z_min = std::min(z0, std::min(z1, z2));
     const float z_max = std::max(z0, std::max(z1, z2));
 
-    face_bboxes[f][0] = x_min;
-    face_bboxes[f][1] = y_min;
-    face_bboxes[f][2] = x_max;
-    face_bboxes[f][3] = y_max;
-    face_bboxes[f][4] = z_min;
-    face_bboxes[f][5] = z_max;
+    face_bboxes_a[f][0] = x_min;
+    face_bboxes_a[f][1] = y_min;
+    face_bboxes_a[f][2] = x_max;
+    face_bboxes_a[f][3] = y_max;
+    face_bboxes_a[f][4] = z_min;
+    face_bboxes_a[f][5] = z_max;
   }
 
   return face_bboxes;
@@ -85,6 +88,7 @@ auto ComputeFaceAreas(const torch::Tensor& face_verts) {
   auto float_opts = face_verts.options().dtype(torch::kFloat32);
   auto face_verts_a = face_verts.accessor<float, 3>();
   torch::Tensor face_areas = torch::full({total_F}, -1, float_opts);
+  auto face_areas_a = face_areas.accessor<float, 1>();
 
   // Loop through all the faces
   for (int f = 0; f < total_F; ++f) {
@@ -99,7 +103,7 @@ auto ComputeFaceAreas(const torch::Tensor& face_verts) {
     const vec2<float> v2(x2, y2);
 
     const float face_area = EdgeFunctionForward(v0, v1, v2);
-    face_areas[f] = face_area;
+    face_areas_a[f] = face_area;
   }
 
   return face_areas;
@@ -477,7 +481,8 @@ torch::Tensor RasterizeMeshesCoarseCpu(
     const std::tuple<int, int> image_size,
     const float blur_radius,
     const int bin_size,
-    const int max_faces_per_bin) {
+    const int max_faces_per_bin,
+    const bool cull_backfaces) {
   if (face_verts.ndimension() != 3 || face_verts.size(1) != 3 ||
       face_verts.size(2) != 3) {
     AT_ERROR("face_verts must have dimensions (num_faces, 3, 3)");
@@ -505,6 +510,11 @@ torch::Tensor RasterizeMeshesCoarseCpu(
   auto face_bboxes = ComputeFaceBoundingBoxes(face_verts);
   auto face_bboxes_a = face_bboxes.accessor<float, 2>();
 
+  // Precompute all face areas so that back facing and degenerate faces can
+  // be skipped before they are added to any bin.
+  auto face_areas = ComputeFaceAreas(face_verts);
+  auto face_areas_a = face_areas.accessor<float, 1>();
+
   const float ndc_x_range = NonSquareNdcRange(W, H);
   const float pixel_width_x = ndc_x_range / W;
   const float bin_width_x = pixel_width_x * bin_size;
@@ -546,6 +556,16 @@ torch::Tensor RasterizeMeshesCoarseCpu(
             continue;
           }
 
+          // Skip faces which the fine rasterizer would reject.
+          const float face_area = face_areas_a[f];
+          const bool back_face = face_area < 0.0;
+          if (cull_backfaces && back_face) {
+            continue;
+          }
+          if (face_area <= kEpsilon && face_area >= -1.0f * kEpsilon) {
+            continue;
+          }
+
           // Use a half-open interval so that faces exactly on the
           // boundary between bins will fall into exactly one bin.
           bool x_overlap =
@@ -36,7 +36,13 @@ const auto kEpsilon = 1e-8;
 //
 __device__ inline float
 EdgeFunctionForward(const float2& p, const float2& v0, const float2& v1) {
-  return (p.x - v0.x) * (v1.y - v0.y) - (p.y - v0.y) * (v1.x - v0.x);
+  // Uses the two product form (4 subs, 1 mul, 1 fma) rather than expanding
+  // the determinant, which costs extra multiplies per edge.
+  const float dx_p = p.x - v0.x;
+  const float dy_p = p.y - v0.y;
+  const float dx_e = v1.x - v0.x;
+  const float dy_e = v1.y - v0.y;
+  return fmaf(dx_p, dy_e, -(dy_p * dx_e));
 }
 
 // Backward pass for the edge function returning partial dervivatives for each
@@ -79,9 +85,12 @@ __device__ inline float3 BarycentricCoordsForward(
     const float2& v1,
     const float2& v2) {
   const float area = EdgeFunctionForward(v2, v0, v1) + kEpsilon;
-  const float w0 = EdgeFunctionForward(p, v1, v2) / area;
-  const float w1 = EdgeFunctionForward(p, v2, v0) / area;
-  const float w2 = EdgeFunctionForward(p, v0, v1) / area;
+  // Take the reciprocal of the area once and share it across the three
+  // coordinates instead of doing three divisions.
+  const float area_inv = __frcp_rn(area);
+  const float w0 = EdgeFunctionForward(p, v1, v2) * area_inv;
+  const float w1 = EdgeFunctionForward(p, v2, v0) * area_inv;
+  const float w2 = EdgeFunctionForward(p, v0, v1) * area_inv;
   return make_float3(w0, w1, w2);
 }
 
@@ -245,15 +254,17 @@ BarycentricPerspectiveCorrectionBackward(
 //
 __device__ inline float3 BarycentricClipForward(const float3 bary) {
   float3 w = make_float3(0.0f, 0.0f, 0.0f);
-  // Clamp lower bound only
-  w.x = max(bary.x, 0.0);
-  w.y = max(bary.y, 0.0);
-  w.z = max(bary.z, 0.0);
-  float w_sum = w.x + w.y + w.z;
-  w_sum = fmaxf(w_sum, 1e-5);
-  w.x /= w_sum;
-  w.y /= w_sum;
-  w.z /= w_sum;
+  // Clamp lower bound only. Use the single precision fmaxf so that this
+  // stays branchless and avoids promoting to double.
+  w.x = fmaxf(bary.x, 0.0f);
+  w.y = fmaxf(bary.y, 0.0f);
+  w.z = fmaxf(bary.z, 0.0f);
+  // Clamping the sum guards against all the coordinates being clipped to 0.
+  const float w_sum = fmaxf(w.x + w.y + w.z, 1e-5f);
+  const float w_sum_inv = __frcp_rn(w_sum);
+  w.x *= w_sum_inv;
+  w.y *= w_sum_inv;
+  w.z *= w_sum_inv;
 
   return w;
 }
@@ -98,9 +98,12 @@ vec3<T> BarycentricCoordinatesForward(
     const vec2<T>& v1,
     const vec2<T>& v2) {
   const T area = EdgeFunctionForward(v2, v0, v1) + kEpsilon;
-  const T w0 = EdgeFunctionForward(p, v1, v2) / area;
-  const T w1 = EdgeFunctionForward(p, v2, v0) / area;
-  const T w2 = EdgeFunctionForward(p, v0, v1) / area;
+  // Take the reciprocal of the area once and share it across the three
+  // coordinates instead of doing three divisions.
+  const T area_inv = 1.0f / area;
+  const T w0 = EdgeFunctionForward(p, v1, v2) * area_inv;
+  const T w1 = EdgeFunctionForward(p, v2, v0) * area_inv;
+  const T w2 = EdgeFunctionForward(p, v0, v1) * area_inv;
   return vec3<T>(w0, w1, w2);
 }
 
@@ -271,11 +274,12 @@ vec3<T> BarycentricClipForward(const vec3<T> bary) {
   w.x = std::max(bary.x, 0.0f);
   w.y = std::max(bary.y, 0.0f);
   w.z = std::max(bary.z, 0.0f);
-  float w_sum = w.x + w.y + w.z;
-  w_sum = std::fmaxf(w_sum, 1e-5);
-  w.x /= w_sum;
-  w.y /= w_sum;
-  w.z /= w_sum;
+  // Clamping the sum guards against all the coordinates being clipped to 0.
+  const T w_sum = std::fmaxf(w.x + w.y + w.z, 1e-5);
+  const T w_sum_inv = 1.0f / w_sum;
+  w.x *= w_sum_inv;
+  w.y *= w_sum_inv;
+  w.z *= w_sum_inv;
   return w;
 }
 
@@ -4,7 +4,7 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, Optional, Tuple, Union
 
 import torch
 
@@ -113,7 +113,7 @@ class ClipFrustum:
         cull: if True, triangles outside the frustum should be culled
         z_clip_value: if not None, then triangles should be clipped (possibly into
             smaller triangles) such that z >= z_clip_value.  This avoids projections
-            that go to infinity as z->0
+            that go to infinity as z->0. Can be a float or a 0-d tensor.
     """
 
     __slots__ = [
@@ -138,7 +138,7 @@ class ClipFrustum:
         zfar: Optional[float] = None,
         perspective_correct: bool = False,
         cull: bool = True,
-        z_clip_value: Optional[float] = None,
+        z_clip_value: Optional[Union[float, torch.Tensor]] = None,
     ) -> None:
         self.left = left
         self.right = right
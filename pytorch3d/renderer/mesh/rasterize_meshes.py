@@ -36,7 +36,7 @@ def rasterize_meshes(
     perspective_correct: bool = False,
     clip_barycentric_coords: bool = False,
     cull_backfaces: bool = False,
-    z_clip_value: Optional[float] = None,
+    z_clip_value: Optional[Union[float, torch.Tensor]] = None,
     cull_to_frustum: bool = False,
 ):
     """
@@ -93,6 +93,8 @@ def rasterize_meshes(
         z_clip_value: if not None, then triangles will be clipped (and possibly
             subdivided into smaller triangles) such that z >= z_clip_value.
             This avoids camera projections that go to infinity as z->0.
+            Can be a float or a 0-d tensor, which avoids a device sync when
+            the value is derived from tensors on the GPU.
             Default is None as clipping affects rasterization speed and
             should only be turned on if explicitly needed.
             See clip.py for all the extra computation that is required.
@@ -144,6 +146,59 @@ def rasterize_meshes(
     mesh_to_face_first_idx = meshes.mesh_to_faces_packed_first_idx()
     num_faces_per_mesh = meshes.num_faces_per_mesh()
 
+    return _rasterize_face_verts(
+        face_verts,
+        mesh_to_face_first_idx,
+        num_faces_per_mesh,
+        max_faces_per_mesh=meshes._F,
+        image_size=image_size,
+        blur_radius=blur_radius,
+        faces_per_pixel=faces_per_pixel,
+        bin_size=bin_size,
+        max_faces_per_bin=max_faces_per_bin,
+        perspective_correct=perspective_correct,
+        clip_barycentric_coords=clip_barycentric_coords,
+        cull_backfaces=cull_backfaces,
+        z_clip_value=z_clip_value,
+        cull_to_frustum=cull_to_frustum,
+    )
+
+
+def _rasterize_face_verts(
+    face_verts: torch.Tensor,
+    mesh_to_face_first_idx: torch.Tensor,
+    num_faces_per_mesh: torch.Tensor,
+    max_faces_per_mesh: int,
+    image_size: Union[int, List[int], Tuple[int, int]] = 256,
+    blur_radius: float = 0.0,
+    faces_per_pixel: int = 8,
+    bin_size: Optional[int] = None,
+    max_faces_per_bin: Optional[int] = None,
+    perspective_correct: bool = False,
+    clip_barycentric_coords: bool = False,
+    cull_backfaces: bool = False,
+    z_clip_value: Optional[Union[float, torch.Tensor]] = None,
+    cull_to_frustum: bool = False,
+):
+    """
+    Rasterize a batch of meshes given by the (packed) vertex positions of
+    their faces, so that callers which already have these do not need to
+    build a Meshes object.
+
+    Args:
+        face_verts: Tensor of shape (F, 3, 3) giving (packed) vertex positions
+            for faces in all the meshes in the batch, in NDC space.
+        mesh_to_face_first_idx: LongTensor of shape (N) giving the index in
+            face_verts of the first face in each mesh in the batch.
+        num_faces_per_mesh: LongTensor of shape (N) giving the number of faces
+            for each mesh in the batch.
+        max_faces_per_mesh: the maximum number of faces in a mesh of the batch,
+            used to set max_faces_per_bin if it is None.
+        All other arguments are the same as in rasterize_meshes.
+
+    Returns:
+        same as rasterize_meshes.
+    """
     # In the case that H != W use the max image size to set the bin_size
     # to accommodate the num bins constraint in the coarse rasterizer.
     # If the ratio of H:W is large this might cause issues as the smaller
@@ -196,13 +251,13 @@ def rasterize_meshes(
         clipped_faces_neighbor_idx = torch.full(
             size=(face_verts.shape[0],),
             fill_value=-1,
-            device=meshes.device,
+            device=face_verts.device,
             dtype=torch.int64,
         )
 
     # TODO: Choose naive vs coarse-to-fine based on mesh size and image size.
     if bin_size is None:
-        if not verts_packed.is_cuda:
+        if not face_verts.is_cuda:
             # Binned CPU rasterization is not supported.
             bin_size = 0
         else:
@@ -228,7 +283,7 @@ def rasterize_meshes(
             )
 
     if max_faces_per_bin is None:
-        max_faces_per_bin = int(max(10000, meshes._F / 5))
+        max_faces_per_bin = int(max(10000, max_faces_per_mesh / 5))
 
     # pyre-fixme[16]: `_RasterizeFaceVerts` has no attribute `apply`.
     pix_to_face, zbuf, barycentric_coords, dists = _RasterizeFaceVerts.apply(
@@ -5,12 +5,13 @@
 # LICENSE file in the root directory of this source tree.
 
 from dataclasses import dataclass
-from typing import NamedTuple, Optional, Tuple, Union
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
 
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
-from .rasterize_meshes import rasterize_meshes
+from .rasterize_meshes import _rasterize_face_verts
 
 
 # Class to store the outputs of mesh rasterization
@@ -69,6 +70,20 @@ class RasterizationSettings:
         cull_to_frustum: Whether to cull triangles outside the view frustum.
             Culling involves removing all faces which fall outside view frustum.
             Default is False for performance as often not needed.
+        cache_camera_transforms: Whether MeshRasterizer may reuse the
+            transformation matrices computed for the same cameras in a previous
+            call. The cache is invalidated if the cameras or any of their
+            tensors are replaced or modified in place, and is not used when
+            the camera parameters require grad. In place updates which do not
+            bump the tensor version counter, e.g. through `.data` or through
+            a numpy array sharing the memory, are not detected: replace the
+            tensor instead or disable the cache.
+        transform_dtype: dtype used for the matmul which projects the vertices
+            to NDC x/y, e.g. torch.bfloat16 or torch.float16 to halve the memory
+            traffic on GPUs with reduced precision tensor cores. The view space
+            z used for the depth test is always computed in the vertex dtype.
+            Only used for vertices on the GPU, as reduced precision matmuls are
+            not supported on the CPU. Default is None, i.e. the vertex dtype.
     """
 
     image_size: Union[int, Tuple[int, int]] = 256
@@ -81,6 +96,121 @@ class RasterizationSettings:
     cull_backfaces: bool = False
     z_clip_value: Optional[float] = None
     cull_to_frustum: bool = False
+    cache_camera_transforms: bool = True
+    transform_dtype: Optional[torch.dtype] = None
+
+
+# Keyword arguments of the rasterizer which are not read by the cameras.
+_NON_CAMERA_KWARGS = ("cameras", "raster_settings", "eps")
+
+
+def _object_state(values: Dict[str, Any]) -> Dict[str, Tuple[Any, Optional[int]]]:
+    """
+    Snapshot the identity of a set of values together with the version counter
+    of those which are tensors, for comparison with _same_state.
+    """
+    return {k: (v, getattr(v, "_version", None)) for k, v in values.items()}
+
+
+def _same_state(
+    state1: Dict[str, Tuple[Any, Optional[int]]],
+    state2: Dict[str, Tuple[Any, Optional[int]]],
+) -> bool:
+    """
+    Whether two snapshots from _object_state refer to the same, unmodified
+    values.
+    """
+    if state1.keys() != state2.keys():
+        return False
+    return all(
+        state1[k][0] is state2[k][0] and state1[k][1] == state2[k][1] for k in state1
+    )
+
+
+def _stacked_matrix(cameras, **kwargs) -> Tuple[torch.Tensor, torch.Tensor]:
+    """
+    Compose the world to NDC matrices of a batch of cameras.
+
+    The (row major) matrices of the individual transforms are multiplied
+    directly, which broadcasts over the cameras in one batched matmul and
+    avoids creating intermediate Transform3d objects.
+
+    Args:
+        cameras: a cameras object.
+        kwargs: passed on to the cameras' transform getters.
+
+    Returns:
+        2-element tuple of
+        - **ndc_matrix**: Tensor of shape (N, 4, 4) or (1, 4, 4) giving the
+          world to NDC transformation.
+        - **view_matrix**: Tensor of shape (N, 4, 4) or (1, 4, 4) giving the
+          world to view transformation.
+    """
+    view_matrix = cameras.get_world_to_view_transform(**kwargs).get_matrix()
+    proj_matrix = cameras.get_projection_transform(**kwargs).get_matrix()
+    to_ndc_matrix = cameras.get_ndc_camera_transform(**kwargs).get_matrix()
+    ndc_matrix = view_matrix @ proj_matrix @ to_ndc_matrix
+    return ndc_matrix, view_matrix
+
+
+def _transform_verts_to_ndc(
+    verts_world: torch.Tensor,
+    ndc_matrix: torch.Tensor,
+    view_matrix: torch.Tensor,
+    eps: Optional[float] = None,
+    dtype: Optional[torch.dtype] = None,
+    verts_h: Optional[torch.Tensor] = None,
+) -> torch.Tensor:
+    """
+    Transform points from world space to NDC space while retaining the
+    view space z coordinate.
+
+    The z column of the world to NDC matrix is swapped for the z column of
+    the world to view matrix, so that x, y, view z and w all come out of a
+    single matmul. Only x and y are divided by w, and the output is assembled
+    in one step rather than by writing the z slice of the NDC points in place.
+
+    Args:
+        verts_world: Tensor of shape (N, V, 3) giving the points in world space.
+        ndc_matrix: Tensor of shape (N, 4, 4) or (1, 4, 4) with the
+            (row major) world to NDC transformation.
+        view_matrix: Tensor of shape (N, 4, 4) or (1, 4, 4) with the
+            (row major) world to view transformation.
+        eps: same as in Transform3d.transform_points.
+        dtype: if not None, the dtype in which to compute the projected x, y
+            and w. The result is cast back to the dtype of verts_world and the
+            view space z is always computed in the dtype of verts_world.
+            Ignored if verts_world is not on the GPU.
+        verts_h: if not None, Tensor of shape (N, V, 4) holding verts_world
+            already padded with w = 1. Otherwise it is allocated here.
+
+    Returns:
+        verts_ndc: Tensor of shape (N, V, 3) with x, y in NDC space and z
+        in view space.
+    """
+    ndc_matrix, view_matrix = torch.broadcast_tensors(ndc_matrix, view_matrix)
+    if verts_h is None:
+        verts_h = F.pad(verts_world, (0, 1), value=1.0)
+    if dtype is None or dtype == verts_world.dtype or not verts_world.is_cuda:
+        matrix = torch.cat(
+            [ndc_matrix[:, :, :2], view_matrix[:, :, 2:3], ndc_matrix[:, :, 3:]],
+            dim=2,
+        )
+        points_out = verts_h @ matrix
+    else:
+        # Only x, y and w are computed in reduced precision, the view space z
+        # is kept at full precision for the z buffer.
+        matrix = torch.cat([ndc_matrix[:, :, :2], ndc_matrix[:, :, 3:]], dim=2)
+        xyw = (verts_h.to(dtype) @ matrix.to(dtype)).to(verts_world.dtype)
+        z = verts_h @ view_matrix[:, :, 2:3]
+        points_out = torch.cat([xyw[..., :2], z, xyw[..., 2:]], dim=-1)
+    # The world to view transform is rigid so its w is always 1, and only the
+    # x and y coordinates need to be divided by the projected w.
+    denom = points_out[..., 3:]
+    if eps is not None:
+        denom_sign = denom.sign() + (denom == 0.0).type_as(denom)
+        denom = denom_sign * torch.clamp(denom.abs(), eps)
+    return torch.cat([points_out[..., :2] / denom, points_out[..., 2:3]], dim=-1)
 
 
 class MeshRasterizer(nn.Module):
@@ -107,24 +237,156 @@ class MeshRasterizer(nn.Module):
 
         self.cameras = cameras
         self.raster_settings = raster_settings
+        # Cache of the values derived from the cameras, see _camera_cache.
+        self._cam_cache = {}
+        # Buffer for the homogeneous vertices, see _homogeneous_verts.
+        self._verts_h_buf: Optional[torch.Tensor] = None
+        self._verts_h_capacity = 0
 
     def to(self, device):
         # Manually move to device cameras as it is not a subclass of nn.Module
         self.cameras = self.cameras.to(device)
+        self._cam_cache = {}
+        self._verts_h_buf = None
+        self._verts_h_capacity = 0
         return self
 
-    def transform(self, meshes_world, **kwargs) -> torch.Tensor:
+    def _homogeneous_verts(self, verts_world) -> torch.Tensor:
+        """
+        Returns verts_world padded with w = 1, written into a buffer which is
+        kept across calls so that it is not allocated for every frame. The
+        buffer is grown with some headroom for the number of vertices, and its
+        w column is only filled when it is allocated.
+
+        The buffer is overwritten by the next call, so the result must not be
+        used in computations which save it for the backward pass.
+        """
+        N, V, _ = verts_world.shape
+        buf = self._verts_h_buf
+        if (
+            buf is None
+            or buf.shape[0] < N
+            or V > self._verts_h_capacity
+            or buf.dtype != verts_world.dtype
+            or buf.device != verts_world.device
+        ):
+            self._verts_h_capacity = V + V // 2
+            buf = verts_world.new_ones((N, self._verts_h_capacity, 4))
+            self._verts_h_buf = buf
+        verts_h = buf[:N, :V]
+        verts_h[..., :3].copy_(verts_world)
+        return verts_h
+
+    def _camera_cache(self, cameras) -> Dict[str, Any]:
+        """
+        Returns the dict of values cached for the cameras.
+
+        The cache is keyed by the identity of the cameras and of all their
+        attributes, together with the version counter which tensors bump on
+        every in place modification. If any of these changed the cached values
+        are dropped. Only the most recently used cameras are kept so that the
+        cache does not grow (or keep cameras alive) when new cameras are
+        created for every call.
+        """
+        state = _object_state(vars(cameras))
+        cached = self._cam_cache.get(id(cameras), None)
+        if cached is not None:
+            cached_cameras, cached_state, values = cached
+            if cached_cameras is cameras and _same_state(cached_state, state):
+                return values
+        values = {}
+        self._cam_cache = {id(cameras): (cameras, state, values)}
+        return values
+
+    def _camera_settings(
+        self, cameras
+    ) -> Tuple[bool, Optional[Union[float, torch.Tensor]]]:
+        """
+        Returns whether the cameras use a perspective projection and the
+        (minimum) near clipping plane of the cameras.
+
+        If the near plane is a tensor its minimum is returned as a 0-d tensor
+        on the same device, rather than as a float which would force a device
+        sync. It is only used as a constant, so it is detached.
+        """
+        values = self._camera_cache(cameras)
+        if "settings" not in values:
+            znear = cameras.get_znear()
+            if isinstance(znear, torch.Tensor):
+                znear = znear.min().detach()
+            values["settings"] = (cameras.is_perspective(), znear)
+        return values["settings"]
+
+    def _camera_matrices(self, cameras, **kwargs) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Returns the world to NDC and world to view matrices of the cameras,
+        see _stacked_matrix.
+
+        The matrices are cached with the cameras, and are also keyed by the
+        identity of the keyword arguments which may be consumed by the cameras.
+        They are recomputed when caching is disabled in the raster_settings or
+        when any of the inputs requires grad, as the matrices then need to be
+        part of the current autograd graph.
+        """
+        raster_settings = kwargs.get("raster_settings", self.raster_settings)
+        camera_kwargs = {k: v for k, v in kwargs.items() if k not in _NON_CAMERA_KWARGS}
+        kwargs_state = _object_state(camera_kwargs)
+        tensors = [v for v in vars(cameras).values() if torch.is_tensor(v)]
+        tensors += [v for v in camera_kwargs.values() if torch.is_tensor(v)]
+        requires_grad = torch.is_grad_enabled() and any(
+            t.requires_grad for t in tensors
+        )
+        if not raster_settings.cache_camera_transforms or requires_grad:
+            return _stacked_matrix(cameras, **kwargs)
+
+        values = self._camera_cache(cameras)
+        cached = values.get("matrices", None)
+        if cached is not None and _same_state(cached[0], kwargs_state):
+            return cached[1]
+
+        matrices = _stacked_matrix(cameras, **kwargs)
+        # The camera getters may store keyword arguments (e.g. R and T) on
+        # the cameras, so look up the cache entry again after calling them.
+        values = self._camera_cache(cameras)
+        values["matrices"] = (kwargs_state, matrices)
+        return matrices
+
+    def _resolve_settings(
+        self, cameras, raster_settings
+    ) -> Tuple[bool, Optional[Union[float, torch.Tensor]]]:
+        """
+        Infer perspective_correct and z_clip_value from the cameras if they
+        are not set in the raster_settings.
+
+        Returns:
+            2-element tuple of (perspective_correct, z_clip)
+        """
+        if (
+            raster_settings.perspective_correct is not None
+            and raster_settings.z_clip_value is not None
+        ):
+            return raster_settings.perspective_correct, raster_settings.z_clip_value
+
+        is_perspective, znear = self._camera_settings(cameras)
+        if raster_settings.perspective_correct is not None:
+            perspective_correct = raster_settings.perspective_correct
+        else:
+            perspective_correct = is_perspective
+        if raster_settings.z_clip_value is not None:
+            z_clip = raster_settings.z_clip_value
+        else:
+            z_clip = None if not perspective_correct or znear is None else znear / 2
+        return perspective_correct, z_clip
+
+    def _transform_verts(self, meshes_world, **kwargs) -> torch.Tensor:
         """
         Args:
             meshes_world: a Meshes object representing a batch of meshes with
                 vertex coordinates in world space.
 
         Returns:
-            meshes_proj: a Meshes object with the vertex positions projected
-            in NDC space
-
-        NOTE: keeping this as a separate function for readability but it could
-        be moved into forward.
+            verts_ndc: Tensor of shape (N, V, 3) giving the padded vertex
+            positions projected in NDC space.
         """
         cameras = kwargs.get("cameras", self.cameras)
         if cameras is None:
@@ -143,31 +405,48 @@ class MeshRasterizer(nn.Module):
         # TODO: Revisit whether or not to transform z coordinate to [-1, 1] or
         # [0, 1] range.
         eps = kwargs.get("eps", None)
-        verts_view = cameras.get_world_to_view_transform(**kwargs).transform_points(
-            verts_world, eps=eps
+        raster_settings = kwargs.get("raster_settings", self.raster_settings)
+        ndc_matrix, view_matrix = self._camera_matrices(cameras, **kwargs)
+        # The homogeneous vertices are saved for the backward pass of the
+        # matmuls if any of the inputs require grad, in which case they can't
+        # be written to the shared buffer.
+        requires_grad = torch.is_grad_enabled() and any(
+            t.requires_grad for t in (verts_world, ndc_matrix, view_matrix)
         )
-        # view to NDC transform
-        to_ndc_transform = cameras.get_ndc_camera_transform(**kwargs)
-        projection_transform = cameras.get_projection_transform(**kwargs).compose(
-            to_ndc_transform
+        verts_h = None if requires_grad else self._homogeneous_verts(verts_world)
+        verts_ndc = _transform_verts_to_ndc(
+            verts_world,
+            ndc_matrix,
+            view_matrix,
+            eps=eps,
+            dtype=raster_settings.transform_dtype,
+            verts_h=verts_h,
         )
-        verts_ndc = projection_transform.transform_points(verts_view, eps=eps)
-
-        verts_ndc[..., 2] = verts_view[..., 2]
-        meshes_ndc = meshes_world.update_padded(new_verts_padded=verts_ndc)
-        return meshes_ndc
+        return verts_ndc
 
-    def forward(self, meshes_world, **kwargs) -> Fragments:
+    def transform(self, meshes_world, **kwargs) -> torch.Tensor:
         """
         Args:
             meshes_world: a Meshes object representing a batch of meshes with
-                          coordinates in world space.
+                vertex coordinates in world space.
+
         Returns:
-            Fragments: Rasterization outputs as a named tuple.
+            meshes_proj: a Meshes object with the vertex positions projected
+            in NDC space
+
+        NOTE: forward does not call this, as the rasterizer only needs the
+        projected vertex positions and not a full Meshes object.
         """
-        meshes_proj = self.transform(meshes_world, **kwargs)
-        raster_settings = kwargs.get("raster_settings", self.raster_settings)
+        verts_ndc = self._transform_verts(meshes_world, **kwargs)
+        meshes_ndc = meshes_world.update_padded(new_verts_padded=verts_ndc)
+        return meshes_ndc
 
+    def _compute_params(self, raster_settings, cameras) -> Dict[str, Any]:
+        """
+        Resolve the raster settings into the keyword arguments for
+        rasterize_meshes, filling in the defaults which depend on the other
+        settings or on the cameras.
+        """
         # By default, turn on clip_barycentric_coords if blur_radius > 0.
         # When blur_radius > 0, a face can be matched to a pixel that is outside the
         # face, resulting in negative barycentric coordinates.
@@ -176,31 +455,46 @@ class MeshRasterizer(nn.Module):
             clip_barycentric_coords = raster_settings.blur_radius > 0.0
 
         # If not specified, infer perspective_correct and z_clip_value from the camera
+        perspective_correct, z_clip = self._resolve_settings(cameras, raster_settings)
+
+        return {
+            "image_size": raster_settings.image_size,
+            "blur_radius": raster_settings.blur_radius,
+            "faces_per_pixel": raster_settings.faces_per_pixel,
+            "bin_size": raster_settings.bin_size,
+            "max_faces_per_bin": raster_settings.max_faces_per_bin,
+            "clip_barycentric_coords": clip_barycentric_coords,
+            "perspective_correct": perspective_correct,
+            "cull_backfaces": raster_settings.cull_backfaces,
+            "z_clip_value": z_clip,
+            "cull_to_frustum": raster_settings.cull_to_frustum,
+        }
+
+    def forward(self, meshes_world, **kwargs) -> Fragments:
+        """
+        Args:
+            meshes_world: a Meshes object representing a batch of meshes with
+                          coordinates in world space.
+        Returns:
+            Fragments: Rasterization outputs as a named tuple.
+        """
+        verts_ndc = self._transform_verts(meshes_world, **kwargs)
+        raster_settings = kwargs.get("raster_settings", self.raster_settings)
         cameras = kwargs.get("cameras", self.cameras)
-        if raster_settings.perspective_correct is not None:
-            perspective_correct = raster_settings.perspective_correct
-        else:
-            perspective_correct = cameras.is_perspective()
-        if raster_settings.z_clip_value is not None:
-            z_clip = raster_settings.z_clip_value
-        else:
-            znear = cameras.get_znear()
-            if isinstance(znear, torch.Tensor):
-                znear = znear.min().item()
-            z_clip = None if not perspective_correct or znear is None else znear / 2
+        params = self._compute_params(raster_settings, cameras)
 
-        pix_to_face, zbuf, bary_coords, dists = rasterize_meshes(
-            meshes_proj,
-            image_size=raster_settings.image_size,
-            blur_radius=raster_settings.blur_radius,
-            faces_per_pixel=raster_settings.faces_per_pixel,
-            bin_size=raster_settings.bin_size,
-            max_faces_per_bin=raster_settings.max_faces_per_bin,
-            clip_barycentric_coords=clip_barycentric_coords,
-            perspective_correct=perspective_correct,
-            cull_backfaces=raster_settings.cull_backfaces,
-            z_clip_value=z_clip,
-            cull_to_frustum=raster_settings.cull_to_frustum,
+        # Gather the projected vertices of each face directly rather than
+        # building a Meshes object with the projected vertices.
+        verts_packed = verts_ndc.reshape(-1, 3)[
+            meshes_world.verts_padded_to_packed_idx()
+        ]
+        face_verts = verts_packed[meshes_world.faces_packed()]
+        pix_to_face, zbuf, bary_coords, dists = _rasterize_face_verts(
+            face_verts,
+            meshes_world.mesh_to_faces_packed_first_idx(),
+            meshes_world.num_faces_per_mesh(),
+            max_faces_per_mesh=meshes_world._F,
+            **params,
         )
         return Fragments(
             pix_to_face=pix_to_face, zbuf=zbuf, bary_coords=bary_coords, dists=dists
@@ -524,7 +524,8 @@ class TexturesAtlas(TexturesBase):
         w_y = torch.where(below_diag, w_y, (R - 1 - w_y))
 
         texels = atlas_packed[pix_to_face, w_y, w_x]
-        texels = texels * (pix_to_face >= 0)[..., None].float()
+        # Reuse the padded pixel mask rather than building a float mask.
+        texels = texels.masked_fill(mask, 0.0)
 
         return texels
 
@@ -332,6 +332,7 @@ class TestRasterizeMeshes(TestCaseMixin, unittest.TestCase):
             blur_radius,
             bin_size,
             max_faces_per_bin,
+            False,  # cull_backfaces
         )
         device = get_random_cuda_device()
         meshes = meshes.clone().to(device)
@@ -350,6 +351,7 @@ class TestRasterizeMeshes(TestCaseMixin, unittest.TestCase):
             blur_radius,
             bin_size,
             max_faces_per_bin,
+            False,  # cull_backfaces
         )
 
         # Bin faces might not be the same: CUDA version might write them in
@@ -1105,17 +1107,23 @@ class TestRasterizeMeshes(TestCaseMixin, unittest.TestCase):
                 [-0.4,   0.0, -1.5],  # noqa: E241, E201
                 [ 0.6,   0.6, -1.5],  # noqa: E241, E201
                 [ 0.8,   0.0, -1.5],  # noqa: E241, E201
+                [ 0.1,   0.1,  0.5],  # noqa: E241, E201
+                [ 0.2,   0.2,  0.5],  # noqa: E241, E201
+                [ 0.3,   0.3,  0.5],  # noqa: E241, E201
             ],
             device=device,
         )
         # Expected faces using axes convention +Y down, + X right, +Z in
         # Non symmetrical triangles i.e face 0 and 3 are in one bin only
+        # Faces 0, 1 and 5 are back facing, face 2 is front facing.
         faces = torch.tensor(
             [
                 [ 1, 0,  2],  # noqa: E241, E201  bin 01 only
                 [ 4, 3,  5],  # noqa: E241, E201  all bins
                 [ 7, 6,  8],  # noqa: E241, E201  bin 10 only
                 [10, 9, 11],  # noqa: E241, E201  negative z, should not appear.
+                [12, 13, 14],  # noqa: E241, E201  zero area, should not appear.
+                [ 6, 7,  8],  # noqa: E241, E201  face 2 reversed, bin 10 only
             ],
             dtype=torch.int64,
             device=device,
@@ -1133,23 +1141,32 @@ class TestRasterizeMeshes(TestCaseMixin, unittest.TestCase):
             * -1
         )
         bin_faces_expected[0, 1, 1, 0] = torch.tensor([1])
-        bin_faces_expected[0, 0, 1, 0:2] = torch.tensor([1, 2])
+        bin_faces_expected[0, 0, 1, 0:3] = torch.tensor([1, 2, 5])
         bin_faces_expected[0, 1, 0, 0:2] = torch.tensor([0, 1])
         bin_faces_expected[0, 0, 0, 0] = torch.tensor([1])
 
-        # +Y up, +X left, +Z in
-        bin_faces = _C._rasterize_meshes_coarse(
-            faces_verts,
-            mesh_to_face_first_idx,
-            num_faces_per_mesh,
-            image_size,
-            blur_radius,
-            bin_size,
-            max_faces_per_bin,
-        )
+        # With back face culling only the front facing face 2 is kept.
+        bin_faces_culled_expected = torch.full_like(bin_faces_expected, -1)
+        bin_faces_culled_expected[0, 0, 1, 0] = torch.tensor([2])
+
+        for cull_backfaces, expected in [
+            (False, bin_faces_expected),
+            (True, bin_faces_culled_expected),
+        ]:
+            # +Y up, +X left, +Z in
+            bin_faces = _C._rasterize_meshes_coarse(
+                faces_verts,
+                mesh_to_face_first_idx,
+                num_faces_per_mesh,
+                image_size,
+                blur_radius,
+                bin_size,
+                max_faces_per_bin,
+                cull_backfaces,
+            )
 
-        bin_faces_same = (bin_faces.squeeze() == bin_faces_expected).all()
-        self.assertTrue(bin_faces_same.item() == 1)
+            bin_faces_same = (bin_faces.squeeze() == expected).all()
+            self.assertTrue(bin_faces_same.item() == 1)
 
     def test_order_of_ties(self):
         # Tied faces are rasterized in index order
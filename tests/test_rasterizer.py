@@ -12,12 +12,17 @@ import torch
 from common_testing import get_tests_dir
 from PIL import Image
 from pytorch3d.renderer.cameras import FoVPerspectiveCameras, look_at_view_transform
-from pytorch3d.renderer.mesh.rasterizer import MeshRasterizer, RasterizationSettings
+from pytorch3d.renderer.mesh.rasterizer import (
+    MeshRasterizer,
+    RasterizationSettings,
+    _stacked_matrix,
+    _transform_verts_to_ndc,
+)
 from pytorch3d.renderer.points.rasterizer import (
     PointsRasterizationSettings,
     PointsRasterizer,
 )
-from pytorch3d.structures import Pointclouds
+from pytorch3d.structures import Meshes, Pointclouds
 from pytorch3d.utils.ico_sphere import ico_sphere
 
 
@@ -134,6 +139,213 @@ class TestMeshRasterizer(unittest.TestCase):
 
         self.assertTrue(torch.allclose(image, image_ref))
 
+    def test_transform(self):
+        device = torch.device("cuda:0")
+        sphere_meshes = ico_sphere(3, device).extend(4)
+        R, T = look_at_view_transform(
+            dist=torch.tensor([2.0, 2.5, 3.0, 3.5]), elev=30, azim=45, device=device
+        )
+        cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
+        rasterizer = MeshRasterizer(cameras=cameras)
+
+        verts_ndc = rasterizer.transform(sphere_meshes).verts_padded()
+
+        # Reference: transform to view space and then to NDC space.
+        verts_world = sphere_meshes.verts_padded()
+        verts_view = cameras.get_world_to_view_transform().transform_points(verts_world)
+        projection_transform = cameras.get_projection_transform().compose(
+            cameras.get_ndc_camera_transform()
+        )
+        verts_ndc_ref = projection_transform.transform_points(verts_view)
+        verts_ndc_ref[..., 2] = verts_view[..., 2]
+
+        self.assertTrue(torch.allclose(verts_ndc, verts_ndc_ref, atol=1e-5))
+
+    def test_resolve_settings_cache(self):
+        R, T = look_at_view_transform(2.7, 0, 0)
+        cameras = FoVPerspectiveCameras(R=R, T=T, znear=torch.tensor([1.0, 2.0]))
+        rasterizer = MeshRasterizer(cameras=cameras)
+        raster_settings = RasterizationSettings()
+
+        # A tensor znear gives a tensor z_clip to avoid a device sync.
+        perspective_correct, z_clip = rasterizer._resolve_settings(
+            cameras, raster_settings
+        )
+        self.assertTrue(perspective_correct)
+        self.assertIsInstance(z_clip, torch.Tensor)
+        self.assertEqual(z_clip.device, cameras.znear.device)
+        self.assertAlmostEqual(z_clip.item(), 0.5)
+
+        # The cached value is reused until znear is modified.
+        cameras.znear.fill_(4.0)
+        perspective_correct, z_clip = rasterizer._resolve_settings(
+            cameras, raster_settings
+        )
+        self.assertTrue(perspective_correct)
+        self.assertAlmostEqual(z_clip.item(), 2.0)
+
+        # Settings in raster_settings take precedence over the cameras.
+        raster_settings = RasterizationSettings(perspective_correct=False)
+        settings = rasterizer._resolve_settings(cameras, raster_settings)
+        self.assertEqual(settings, (False, None))
+
+    def test_camera_transforms_cache(self):
+        sphere_mesh = ico_sphere(1)
+        R, T = look_at_view_transform(2.7, 0, 0)
+        cameras = FoVPerspectiveCameras(R=R, T=T)
+        rasterizer = MeshRasterizer(cameras=cameras)
+
+        verts1 = rasterizer.transform(sphere_mesh).verts_padded()
+        verts2 = rasterizer.transform(sphere_mesh).verts_padded()
+        self.assertTrue(torch.allclose(verts1, verts2))
+
+        # Modifying the cameras in place invalidates the cache.
+        cameras.T[:, 2] += 1.0
+        verts3 = rasterizer.transform(sphere_mesh).verts_padded()
+        self.assertTrue(torch.allclose(verts3[..., 2], verts1[..., 2] + 1.0))
+
+        # The result matches the one without caching.
+        raster_settings = RasterizationSettings(cache_camera_transforms=False)
+        verts4 = rasterizer.transform(
+            sphere_mesh, raster_settings=raster_settings
+        ).verts_padded()
+        self.assertTrue(torch.allclose(verts3, verts4))
+
+        # Replacing a camera tensor also invalidates the cache.
+        cameras.T = cameras.T + torch.tensor([0.0, 0.0, 1.0])
+        verts5 = rasterizer.transform(sphere_mesh).verts_padded()
+        self.assertTrue(torch.allclose(verts5[..., 2], verts3[..., 2] + 1.0))
+
+        R_new, _ = look_at_view_transform(2.7, 0, 90)
+        cameras.R = R_new
+        verts6 = rasterizer.transform(sphere_mesh).verts_padded()
+        self.assertFalse(torch.allclose(verts6, verts5))
+        verts7 = rasterizer.transform(
+            sphere_mesh, raster_settings=raster_settings
+        ).verts_padded()
+        self.assertTrue(torch.allclose(verts6, verts7))
+
+    def test_transform_dtype(self):
+        device = torch.device("cuda:0")
+        sphere_mesh = ico_sphere(3, device)
+        R, T = look_at_view_transform(2.7, 30, 45, device=device)
+        cameras = FoVPerspectiveCameras(device=device, R=R, T=T)
+        rasterizer = MeshRasterizer(cameras=cameras)
+
+        verts = rasterizer.transform(sphere_mesh).verts_padded()
+        raster_settings = RasterizationSettings(transform_dtype=torch.float16)
+        verts_half = rasterizer.transform(
+            sphere_mesh, raster_settings=raster_settings
+        ).verts_padded()
+
+        self.assertEqual(verts_half.dtype, torch.float32)
+        self.assertTrue(torch.allclose(verts_half[..., :2], verts[..., :2], atol=5e-3))
+        # The view space z is computed at full precision.
+        self.assertTrue(torch.allclose(verts_half[..., 2], verts[..., 2]))
+
+    def test_transform_dtype_cpu(self):
+        sphere_mesh = ico_sphere(1)
+        R, T = look_at_view_transform(2.7, 30, 45)
+        cameras = FoVPerspectiveCameras(R=R, T=T)
+        rasterizer = MeshRasterizer(cameras=cameras)
+        verts = rasterizer.transform(sphere_mesh).verts_padded()
+
+        # Reduced precision is not supported on the CPU and is ignored.
+        raster_settings = RasterizationSettings(transform_dtype=torch.float16)
+        verts_half = rasterizer.transform(
+            sphere_mesh, raster_settings=raster_settings
+        ).verts_padded()
+        self.assertTrue(torch.equal(verts_half, verts))
+
+        # By default the vertex dtype is used.
+        ndc_matrix, view_matrix = _stacked_matrix(cameras)
+        verts_double = _transform_verts_to_ndc(
+            sphere_mesh.verts_padded().double(),
+            ndc_matrix.double(),
+            view_matrix.double(),
+            dtype=RasterizationSettings().transform_dtype,
+        )
+        self.assertEqual(verts_double.dtype, torch.float64)
+        self.assertTrue(torch.allclose(verts_double.float(), verts, atol=1e-6))
+
+    def test_homogeneous_verts_buffer(self):
+        sphere_mesh = ico_sphere(1)
+        R, T = look_at_view_transform(2.7, 0, 0)
+        cameras = FoVPerspectiveCameras(R=R, T=T)
+        rasterizer = MeshRasterizer(cameras=cameras)
+
+        verts1 = rasterizer.transform(sphere_mesh).verts_padded()
+        buf = rasterizer._verts_h_buf
+        self.assertIsNotNone(buf)
+        self.assertTrue(torch.all(buf[..., 3] == 1.0))
+
+        # The buffer is reused for meshes with up to as many vertices.
+        rasterizer.transform(ico_sphere(0))
+        self.assertIs(rasterizer._verts_h_buf, buf)
+        verts3 = rasterizer.transform(sphere_mesh).verts_padded()
+        self.assertIs(rasterizer._verts_h_buf, buf)
+        self.assertTrue(torch.allclose(verts1, verts3))
+
+        # A larger mesh grows the buffer.
+        large_mesh = ico_sphere(3)
+        verts5 = rasterizer.transform(large_mesh).verts_padded()
+        new_buf = rasterizer._verts_h_buf
+        self.assertIsNot(new_buf, buf)
+        self.assertGreaterEqual(new_buf.shape[1], large_mesh.verts_padded().shape[1])
+        self.assertTrue(torch.all(new_buf[..., 3] == 1.0))
+
+        # The results match the ones without the buffer, which is not used
+        # when the vertices require grad.
+        rasterizer._verts_h_buf = None
+        sphere_mesh_grad = Meshes(
+            verts=[sphere_mesh.verts_packed().clone().requires_grad_()],
+            faces=[sphere_mesh.faces_packed()],
+        )
+        verts4 = rasterizer.transform(sphere_mesh_grad).verts_padded()
+        self.assertIsNone(rasterizer._verts_h_buf)
+        self.assertTrue(torch.allclose(verts1, verts4))
+        large_mesh_grad = Meshes(
+            verts=[large_mesh.verts_packed().clone().requires_grad_()],
+            faces=[large_mesh.faces_packed()],
+        )
+        verts6 = rasterizer.transform(large_mesh_grad).verts_padded()
+        self.assertIsNone(rasterizer._verts_h_buf)
+        self.assertTrue(torch.allclose(verts5, verts6))
+
+        # Moving the rasterizer clears the buffer.
+        rasterizer.transform(ico_sphere(1))
+        self.assertIsNotNone(rasterizer._verts_h_buf)
+        rasterizer.to("cpu")
+        self.assertIsNone(rasterizer._verts_h_buf)
+
+    def test_homogeneous_verts_buffer_camera_grad(self):
+        # Rendering several views with one rasterizer and camera parameters
+        # which require grad must not overwrite the tensors saved for backward.
+        sphere_mesh = ico_sphere(1)
+        R, T = look_at_view_transform(2.7, 0, 0)
+        R.requires_grad_(True)
+        T.requires_grad_(True)
+        cameras = FoVPerspectiveCameras(R=R, T=T)
+        rasterizer = MeshRasterizer(cameras=cameras)
+
+        R2, T2 = look_at_view_transform(2.7, 0, 90)
+        R2.requires_grad_(True)
+        T2.requires_grad_(True)
+
+        for raster_settings in [
+            RasterizationSettings(),
+            RasterizationSettings(cache_camera_transforms=False),
+        ]:
+            verts1 = rasterizer.transform(
+                sphere_mesh, raster_settings=raster_settings
+            ).verts_padded()
+            verts2 = rasterizer.transform(
+                sphere_mesh, R=R2, T=T2, raster_settings=raster_settings
+            ).verts_padded()
+            (verts1.sum() + verts2.sum()).backward()
+            self.assertIsNotNone(R.grad)
+            self.assertIsNotNone(T2.grad)
+
 
 class TestPointRasterizer(unittest.TestCase):
     def test_simple_sphere(self):